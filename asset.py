@@ -12,9 +12,8 @@ __credits__ = []
 
 from sys import getsizeof
 from itertools import chain
-from collections import deque, defaultdict
+from collections import deque, defaultdict, OrderedDict
 import logging
-import pprint
 
 import pygame as pg
 
@@ -25,13 +24,23 @@ log = logging.getLogger(__name__)
 
 class AssetManager(Singleton):
 
+    # Cap on the process-wide load cache (entries, evicted LRU-first)
+    GLOBAL_CACHE_MAX = 256
+
     class AssetStack(object):
         def __init__(self):
             self.assets = defaultdict(lambda: {})
             self.size = 0
 
         def dumpInfo(self):
-            log.debug("\nAssets:\n%s", pprint.pformat(self.assets, indent=4))
+            # pformat over the whole asset map is expensive; don't build
+            # anything when DEBUG is filtered out.
+            if not log.isEnabledFor(logging.DEBUG):
+                return
+
+            log.debug("Assets:")
+            for cls, files in self.assets.items():
+                log.debug("    %s: %d assets", cls.__name__, len(files))
             log.debug("Size: %i", self.size)
 
     # end AssetStack
@@ -46,6 +55,12 @@ class AssetManager(Singleton):
 
         self._managed_loaders = {}
 
+        # Process-wide (asset_class, filename) -> asset cache. Survives
+        # saveAssets/restoreAssets so pushing a new stack doesn't re-load
+        # and re-decode files already in memory. pg.Surface can't be
+        # weakref'd, so this holds strong refs with an LRU cap instead.
+        self._global_cache = OrderedDict()
+
         # Install known loaders
         self.manage(pg.Surface, pg.image, "Image")
         self.manage(TileSet)
@@ -65,13 +80,30 @@ class AssetManager(Singleton):
                 log.debug("Loading %s from cache.", filename)
                 return asset
 
+            # deduplicate across stack boundaries
+            key = (asset_class, filename)
+            asset = self._global_cache.get(key)
+            if asset:
+                log.debug("Loading %s from global cache.", filename)
+                self._global_cache.move_to_end(key)
+                self.trackAsset(filename, asset)
+                return asset
+
             log.debug("Loading %s(%s)-%s into AssetManager.", name, str(asset_class), filename)
             asset = loader.load(filename, *args, **kargs)
+            self._global_cache[key] = asset
+            if len(self._global_cache) > self.GLOBAL_CACHE_MAX:
+                self._global_cache.popitem(last=False)
             self.trackAsset(filename, asset)
             return asset
 
         self._managed_loaders[name] = asset_class
         self.managing[asset_class] = _load
+
+        # Install real attributes so load<Name>/get<Name> calls are direct
+        # instead of going through __getattr__ string slicing every time.
+        setattr(self, "load"+name, _load)
+        setattr(self, "get"+name, lambda filename, c=asset_class: self.getAsset(filename, c))
         return True
 
     def trackAsset(self, filename, asset):
@@ -117,7 +149,10 @@ class AssetManager(Singleton):
         return idx
 
     def dumpDebug(self):
-        log.debug("\nLoaders:\n%s", pprint.pformat(self._managed_loaders, indent=4))
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
+        log.debug("Loaders: %s", ", ".join(self._managed_loaders))
         log.debug("Asset Stacks(%d):", len(self.asset_stack))
         for assets in self.asset_stack:
             assets.dumpInfo()
@@ -138,33 +173,48 @@ class AssetManager(Singleton):
 
         """
         dict_handler = lambda d: chain.from_iterable(d.items())
-        all_handlers = {tuple: iter,
-                        list: iter,
-                        deque: iter,
-                        dict: dict_handler,
-                        set: iter,
-                        frozenset: iter,
-                       }
-        all_handlers.update(handlers)     # user handlers take precedence
+        handler_by_type = {tuple: iter,
+                           list: iter,
+                           deque: iter,
+                           dict: dict_handler,
+                           set: iter,
+                           frozenset: iter,
+                          }
+        handler_by_type.update(handlers)  # user handlers take precedence
         seen = set()                      # track which object id's have already been seen
         default_size = getsizeof(0)       # estimate sizeof object without __sizeof__
 
-        def sizeof(o):
+        # Iterative walk with an O(1) type(o) dispatch instead of recursing
+        # with an isinstance scan over every handler per node. Subclasses
+        # resolve through the MRO once and are memoized for the rest of
+        # the walk.
+        total = 0
+        todo = deque((o,))
+        while todo:
+            o = todo.pop()
             if id(o) in seen:       # do not double count the same object
-                return 0
+                continue
             seen.add(id(o))
             s = getsizeof(o, default_size)
+            total += s
 
             if verbose:
-                log.debug(s, type(o), repr(o))
-
-            for typ, handler in all_handlers.items():
-                if isinstance(o, typ):
-                    s += sum(map(sizeof, handler(o)))
-                    break
-            return s
-
-        return sizeof(o)
+                log.debug("%i %s %s", s, type(o), repr(o))
+
+            otype = type(o)
+            if otype in handler_by_type:
+                handler = handler_by_type[otype]
+            else:
+                handler = None
+                for typ in otype.__mro__:
+                    if typ in handler_by_type:
+                        handler = handler_by_type[typ]
+                        break
+                handler_by_type[otype] = handler
+            if handler:
+                todo.extend(handler(o))
+
+        return total
 
     def _trackSize(self, asset):
         size = getsizeof(asset)
@@ -175,7 +225,8 @@ class AssetManager(Singleton):
     def _load(self, filename, *args, **kargs):
         pass
 
-    # Override getattr to catch and redirect load calls
+    # Fallback for load/get calls on unmanaged names; managed classes get
+    # real bound attributes installed by manage().
     def __getattr__(self, attr):
         # LOAD - load<CLASS>
         if attr.startswith("load"):
@@ -200,6 +251,11 @@ class AssetManager(Singleton):
 
 
 
+# Shared flipped atlases keyed (filename, image size); every TileSet built
+# from the same sheet reuses one mirrored surface instead of duplicating it.
+_FLIP_CACHE = {}
+
+
 class TileSet(object):
 
     def __init__(self, filename, tile_size, flip_image=False):
@@ -213,6 +269,12 @@ class TileSet(object):
         self.flip_image = flip_image
         self.image_flipped = None
 
+        self._converted = False
+        self._tile_rects = []
+        self._tile_rects_flipped = []
+        self._tile_surfs = []
+        self._tile_surfs_flipped = []
+
         self._load(filename)
 
     def _load(self, filename):
@@ -228,14 +290,40 @@ class TileSet(object):
         if self.flip_image:
             self._renderFlipped()
 
+        self._convert()
+        self._buildTileCache()
+
+
+    def _convert(self):
+        """ Match the display pixel format once so every later blit takes
+            SDL's fast path instead of converting per blit. No-op until a
+            display exists; render() retries then. """
+        if pg.display.get_surface() is None:
+            return False
+
+        if self.flip_image or self.image.get_flags() & pg.SRCALPHA:
+            self.image = self.image.convert_alpha()
+        else:
+            self.image = self.image.convert()
+        if self.image_flipped:
+            self.image_flipped = self.image_flipped.convert_alpha()
+            # keep sharers on the converted surface
+            _FLIP_CACHE[(self.filename, self.image_flipped.get_size())] = self.image_flipped
+
+        self._converted = True
+        return True
+
 
     def render(self, surf, pos, tile_idx, flipped=False):
 
         if flipped:
             assert(self.flip_image)
-        
-        tileRect = self.getTileRect(tile_idx)
-        surf.blit(self.image if not flipped else self.image_flipped, pos, tileRect)
+
+        # loaded before display init; convert on first draw instead
+        if not self._converted and self._convert():
+            self._buildTileCache()
+
+        surf.blit(self._tile_surfs_flipped[tile_idx] if flipped else self._tile_surfs[tile_idx], pos)
 
 
     def getTileRect(self, tile_idx):
@@ -243,10 +331,7 @@ class TileSet(object):
         if tile_idx < 0 or tile_idx >= self.numTiles:
             raise IndexError()
 
-        tx = tile_idx % self.tileCounts[0]
-        ty = tile_idx // self.tileCounts[0]
-
-        return pg.Rect((tx*self.tileSize[0], ty*self.tileSize[1]), self.tileSize)
+        return self._tile_rects[tile_idx]
 
 
     def resize(self, new_tile_size):
@@ -257,24 +342,64 @@ class TileSet(object):
             self.image = pg.transform.smoothscale(self.image, new_size)
             self.tileSize = new_tile_size
 
-            if self.image_flip:
+            if self.flip_image:
                 self._renderFlipped()
         except:
             log.warn("Unable to resize TileSet to %s!", str(new_size))
             return False
 
+        self._buildTileCache()
         return True
 
     def getScale(self):
         return (float(self.tileSize[0])/self.srcTileSize[0], float(self.tileSize[1])/self.srcTileSize[1])
 
+    def _tileCoords(self, tile_idx):
+        # mask+shift for power-of-two sheet widths (common for sprite
+        # sheets), a single divmod otherwise
+        if self._cx_is_pow2:
+            return tile_idx >> self._cx_shift, tile_idx & self._cx_mask
+        return divmod(tile_idx, self._cx)
+
+    def _buildTileCache(self):
+        # Precompute tile rects and subsurface views so render() is a single
+        # blit with no per-frame arithmetic or Rect allocation.
+        cx = self.tileCounts[0]
+        tw, th = self.tileSize
+
+        self._cx = cx
+        self._cx_is_pow2 = cx > 0 and (cx & (cx-1)) == 0
+        self._cx_shift = cx.bit_length()-1 if self._cx_is_pow2 else 0
+        self._cx_mask = cx-1
+
+        coords = [self._tileCoords(i) for i in range(self.numTiles)]
+        self._tile_rects = [pg.Rect(tx*tw, ty*th, tw, th) for ty, tx in coords]
+        self._tile_surfs = [self.image.subsurface(r) for r in self._tile_rects]
+
+        # The flipped atlas is the whole image mirrored once, so tile i's
+        # pixels [tx*tw, (tx+1)*tw) land at [iw - (tx+1)*tw, iw - tx*tw)
+        # in the same row. Mirroring around the sheet width (not cx*tw)
+        # keeps tiles aligned when the sheet has a right margin.
+        iw = self.image.get_width()
+        self._tile_rects_flipped = [pg.Rect(iw - (tx+1)*tw, ty*th, tw, th)
+                                    for ty, tx in coords]
+        self._tile_surfs_flipped = []
+        if self.image_flipped:
+            self._tile_surfs_flipped = [self.image_flipped.subsurface(r)
+                                        for r in self._tile_rects_flipped]
+
     def _renderFlipped(self):
-        # Blit each flipped frame into the same location
-        self.image_flipped = pg.Surface(self.image.get_size(), pg.SRCALPHA)
-        self.image_flipped.fill((0, 0, 0, 0))
-        for x in range(self.numTiles):
-            fsurf = pg.transform.flip(self.image.subsurface(self.getTileRect(x)), True, False)
-            self.image_flipped.blit(fsurf, self.getTileRect(x))
+        key = (self.filename, self.image.get_size())
+        cached = _FLIP_CACHE.get(key)
+        if cached:
+            self.image_flipped = cached
+            return
+
+        # Flipping every tile in place is equivalent to mirroring the whole
+        # image once; _buildTileCache remaps tile columns right-to-left.
+        # One transform.flip call, no per-tile subsurface/flip/blit churn.
+        self.image_flipped = pg.transform.flip(self.image, True, False)
+        _FLIP_CACHE[key] = self.image_flipped
 
 #end TileSet
 
@@ -286,18 +411,25 @@ class AnimationSet(TileSet):
         TileSet.__init__(self, filename, tile_size, image_flip)
 
         self.anims = {}
+        self._anim_ids = {}
 
     def addAnim(self, name, start_frame, end_frame):
 
         if name in self.anims or start_frame > end_frame:
             return False
 
+        # each anim gets a small integer id so Animators can compare
+        # "same anim?" without tuple equality
+        self._anim_ids[name] = len(self.anims)
         self.anims[name] = (start_frame, end_frame)
         return True
 
     def getAnim(self, name):
         return self.anims.get(name)
 
+    def getAnimId(self, name):
+        return self._anim_ids.get(name, -1)
+
 #end Animation
 
 
@@ -319,43 +451,90 @@ class Animator(object):
         self.frame = 0
         self.time = 0.0
         self.anim = (0, self.animset.numTiles-1)
+        self._anim_lo, self._anim_hi = self.anim
+        self._anim_id = -1
+
+        # Sprite protocol: image tracks the current tile surface, rect is
+        # the blit destination the caller positions. Lets an Animator drop
+        # straight into pygame.sprite.Group.draw or a blits sequence.
+        self.flipped = False
+        self.image = None
+        self.rect = pg.Rect((0, 0), self.animset.tileSize)
+        self._syncSprite()
 
     def update(self, dt):
         if self.mode == Animator.MODE_STOPPED:
             return
 
-        self.time += dt
-        if self.time > self.period:
-            self.time -= self.period
-            self.next()
+        # Work on a local to avoid repeated attribute loads/stores
+        time = self.time + dt
+        if time > self.period:
+            # A spike dt (hitch, breakpoint, low FPS) can cover several
+            # periods; advance all frames owed instead of lagging one per
+            # update and leaking the excess into self.time.
+            n, time = divmod(time, self.period)
+            for _ in range(int(n)):
+                self.next()
+        self.time = time
+
 
+    # Per-mode frame advance handlers, indexed by mode in next()
+    def _nextStopped(self, lo, hi):
+        pass
+
+    def _nextPlayonce(self, lo, hi):
+        self.frame += 1
+        if self.frame >= hi:
+            self.mode = Animator.MODE_STOPPED
+
+    def _nextLoop(self, lo, hi):
+        self.frame += 1
+        if self.frame > hi:
+            self.frame = lo
+
+    def _nextPing(self, lo, hi):
+        self.frame += 1
+        if self.frame >= hi:
+            self.mode = Animator.MODE_PONG
+
+    def _nextPong(self, lo, hi):
+        self.frame -= 1
+        if self.frame == lo:
+            self.mode = Animator.MODE_PING
+
+    _HANDLERS = (_nextStopped, _nextPlayonce, _nextLoop, _nextPing, _nextPong)
 
     def next(self):
-        anim = self.anim if self.anim else (0, self.animset.numTiles-1)
-        if self.mode == Animator.MODE_PONG:
-            self.frame -= 1
-            if self.frame == anim[0]:
-                self.mode = Animator.MODE_PING
-        elif self.mode != Animator.MODE_STOPPED:
-            self.frame += 1
-            if self.frame >= anim[1]:
-                if self.mode == Animator.MODE_PLAYONCE:
-                    self.mode = Animator.MODE_STOPPED
-                elif self.mode == Animator.MODE_PING:
-                    self.mode = Animator.MODE_PONG
-                elif self.frame > anim[1]: #MODE_LOOP
-                    self.frame = anim[0]
+        # Single indexed dispatch instead of an if/elif chain per tick
+        Animator._HANDLERS[self.mode](self, self._anim_lo, self._anim_hi)
+        self._syncSprite()
+
+    def _syncSprite(self):
+        surfs = self.animset._tile_surfs_flipped if self.flipped else self.animset._tile_surfs
+        if surfs:
+            self.image = surfs[self.frame]
+
+    def setFlipped(self, flipped):
+        if flipped != self.flipped:
+            self.flipped = flipped
+            self._syncSprite()
 
 
     def setAnim(self, name, mode = -1):
-        anim = self.animset.getAnim(name)
+        # int compare instead of tuple equality on the current anim
+        new_id = self.animset.getAnimId(name)
 
-        if anim != self.anim:
+        if new_id != self._anim_id:
+            self._anim_id = new_id
+            anim = self.animset.getAnim(name)
             self.anim = anim
+            # cache the bounds as plain ints for the per-tick handlers
+            self._anim_lo, self._anim_hi = anim if anim else (0, self.animset.numTiles-1)
             if mode >= 0:
                 self.mode = mode
 
-            self.frame = self.anim[1] if self.mode == Animator.MODE_PONG else self.anim[0]
+            self.frame = self._anim_hi if self.mode == Animator.MODE_PONG else self._anim_lo
+            self._syncSprite()
             log.debug("anim set %s", str(anim))
 
 
@@ -368,11 +547,99 @@ class Animator(object):
 
     def setFrame(self, index):
         """ Set current frame based on offset within the current Animation """
-        frame = self.anim[0] + index
-        if frame > self.anim[1]:
+        frame = self._anim_lo + index
+        if frame > self._anim_hi:
             return False
 
         self.frame = frame
+        self._syncSprite()
         return True
 
 #end Animator
+
+
+class AnimatorPool(object):
+    """ SoA batch of animator state ticked in a single loop.
+
+    Holds the Animator state machine fields (time, period, frame, mode,
+    anim bounds) in parallel lists and advances every lane inside one
+    loop, instead of paying a Python method call per Animator per frame.
+    Use for scenes with hundreds of simple looping animations.
+    """
+
+    def __init__(self):
+        self.animsets = []
+        self.times = []
+        self.periods = []
+        self.frames = []
+        self.modes = []
+        self.anim_lo = []
+        self.anim_hi = []
+
+    def add(self, animation_set, mode = Animator.MODE_LOOP, fps = 1.0, anim = None):
+        """ Add one animation lane, returning its index into the pool. """
+        lo, hi = anim if anim else (0, animation_set.numTiles-1)
+        self.animsets.append(animation_set)
+        self.times.append(0.0)
+        self.periods.append(1.0/fps)
+        self.frames.append(hi if mode == Animator.MODE_PONG else lo)
+        self.modes.append(mode)
+        self.anim_lo.append(lo)
+        self.anim_hi.append(hi)
+        return len(self.times) - 1
+
+    def tick(self, dt):
+        # Same state machine as Animator.next(), fused over all lanes
+        times = self.times
+        periods = self.periods
+        frames = self.frames
+        modes = self.modes
+        los = self.anim_lo
+        his = self.anim_hi
+
+        for i in range(len(times)):
+            mode = modes[i]
+            if mode == Animator.MODE_STOPPED:
+                continue
+
+            t = times[i] + dt
+            if t > periods[i]:
+                t -= periods[i]
+                frame = frames[i]
+                if mode == Animator.MODE_PONG:
+                    frame -= 1
+                    if frame == los[i]:
+                        modes[i] = Animator.MODE_PING
+                else:
+                    frame += 1
+                    if frame >= his[i]:
+                        if mode == Animator.MODE_PLAYONCE:
+                            modes[i] = Animator.MODE_STOPPED
+                        elif mode == Animator.MODE_PING:
+                            modes[i] = Animator.MODE_PONG
+                        elif frame > his[i]: #MODE_LOOP
+                            frame = los[i]
+                frames[i] = frame
+            times[i] = t
+
+    def render(self, surf, idx, pos, flipped=False):
+        self.animsets[idx].render(surf, pos, self.frames[idx], flipped)
+
+#end AnimatorPool
+
+
+def render_animators(surf, animators, positions, flipped=False):
+    """ Draw many Animators with a single Surface.blits call.
+
+    Callers should group Animators sharing one AnimationSet for best
+    batching; pygame then stays in its internal C loop instead of paying
+    one Python->C blit call per sprite.
+    """
+    if flipped:
+        surf.blits([(a.animset._tile_surfs_flipped[a.frame], pos)
+                    for a, pos in zip(animators, positions)], doreturn=0)
+    else:
+        surf.blits([(a.animset._tile_surfs[a.frame], pos)
+                    for a, pos in zip(animators, positions)], doreturn=0)
+
+#end render_animators
@@ -9,8 +9,11 @@ __credits__ = []
 
 
 from logging import *
+import threading
 
-stack_depth = 0
+# Per-thread call depth for trace indentation; a plain module global
+# would interleave badly (and race) across threads.
+_stack = threading.local()
 
 # XXX TODO: Should this only be done during some kind of logging initialization?
 CALL = 5 # below DEBUG(10)
@@ -50,12 +53,16 @@ def set_log_options(parsed_args, root_name):
 def log_function(logger, level = CALL):
     def wrap_func(func):
         def logged(*args, **kwargs):
-            global stack_depth
-            logger.log(level, "%s[ENTRY] %s::%s%s", stack_depth*'  ', func.__module__, func.__name__, str(args))
-            stack_depth += 1
+            # Don't pay for str(args)/str(ret) when the level is filtered
+            if not logger.isEnabledFor(level):
+                return func(*args, **kwargs)
+
+            depth = getattr(_stack, 'depth', 0)
+            logger.log(level, "%s[ENTRY] %s::%s%s", depth*'  ', func.__module__, func.__name__, str(args))
+            _stack.depth = depth + 1
             ret = func(*args, **kwargs)
-            stack_depth -= 1
-            logger.log(level, "%s[EXIT ] %s::%s(...) -> (%s)", stack_depth*'  ', func.__module__, func.__name__, str(ret))
+            _stack.depth = depth
+            logger.log(level, "%s[EXIT ] %s::%s(...) -> (%s)", depth*'  ', func.__module__, func.__name__, str(ret))
             return ret
         return logged
     return wrap_func
@@ -63,12 +70,16 @@ def log_function(logger, level = CALL):
 def log_method(logger, level = CALL):
     def wrap_method(method):
         def logged(self, *args, **kwargs):
-            global stack_depth
-            logger.log(level, "%s[ENTRY] %s[%X].%s%s", stack_depth*'  ', self.__class__.__name__, id(self), method.__name__, str(args))
-            stack_depth += 1
+            # Don't pay for str(args)/str(ret) when the level is filtered
+            if not logger.isEnabledFor(level):
+                return method(self, *args, **kwargs)
+
+            depth = getattr(_stack, 'depth', 0)
+            logger.log(level, "%s[ENTRY] %s[%X].%s%s", depth*'  ', self.__class__.__name__, id(self), method.__name__, str(args))
+            _stack.depth = depth + 1
             ret = method(self, *args, **kwargs)
-            stack_depth -= 1
-            logger.log(level, "%s[EXIT ] %s[%X].%s(...)->{%s}", stack_depth*'  ', self.__class__.__name__, id(self), method.__name__, str(ret))
+            _stack.depth = depth
+            logger.log(level, "%s[EXIT ] %s[%X].%s(...)->{%s}", depth*'  ', self.__class__.__name__, id(self), method.__name__, str(ret))
             return ret
         return logged
     return wrap_method
@@ -9,8 +9,16 @@ __credits__ = []
 
 
 # IMPORTS
+import math
+
 from .primitives import Entity, Vector, Circle
 
+# numpy is optional; PhysicsWorld needs it, everything else works without.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # CONSTANTS
 DEFAULT_MAX_VEL = 10.0
 DEFAULT_MASS = 10.0
@@ -30,28 +38,37 @@ class Attributes:
         self.dampen = dampen
         self.radius = radius
 
+        # precomputed for squared-length comparisons on the hot path
+        self.max_vel_sq = max_vel * max_vel
+
 #end PhysicalAttributes
 
 
 class PhysicsEntity(Entity):
     def __init__(self, position, phys_attributes):
         Entity.__init__(self, position)
-        self.phys_attrs = phys_attributes
         self.vel = Vector(0,0)
         self.accel = Vector(0,0)
+        self.applyAttributes(phys_attributes)
 
-    def update(self, time_step):
-        # Apply acceleration
-        self.vel += self.accel * time_step
-        #if self.accel.empty():
-        #    self.dampen()
-
-        # Enforce velocity cap
-        if self.vel.length() > self.phys_attrs.max_vel:
-            self.vel = self.vel.normalized() * self.phys_attrs.max_vel
+    def applyAttributes(self, phys_attributes):
+        """ Flatten the attribute fields onto the entity so hot-path
+            access is one lookup instead of delegation through
+            phys_attrs. Re-call this if a shared Attributes is mutated. """
+        self.phys_attrs = phys_attributes
+        self.max_vel = phys_attributes.max_vel
+        self.max_vel_sq = phys_attributes.max_vel_sq
+        self.mass = phys_attributes.mass
+        self.dampen_factor = phys_attributes.dampen
+        self.radius = phys_attributes.radius
 
-        # update position using velocity
-        self.pos = self.pos + (self.vel*time_step)
+    def update(self, time_step):
+        # Fused in-place integrate: accelerate, cap, move. No intermediate
+        # Vector objects are allocated on this per-entity per-tick path.
+        vel = self.vel
+        vel.iaddScaled(self.accel, time_step)
+        vel.clampLength(self.max_vel)
+        self.pos.iaddScaled(vel, time_step)
 
     def setPosition(self, pos):
         Entity.setPosition(self, pos)
@@ -61,35 +78,98 @@ class PhysicsEntity(Entity):
 
     def setVelocity(self, vel):
         # cap velocity to the max velocity defined in our physical attributes
-        if vel.length() > self.phys_attrs.max_vel:
-            vel = vel.normalized() * self.phys_attrs.max_vel
+        lsq = vel.lengthSq()
+        if lsq > self.max_vel_sq:
+            vel = vel * (self.max_vel / math.sqrt(lsq))
         self.vel = vel
         self.accel.clear()
 
     def applyForce(self, force):
-        accel = force * (1 / self.phys_attrs.mass)
+        accel = force * (1 / self.mass)
         self.vel += accel
 
     def dampen(self, dx=True, dy=True):
-        self.vel.set(self.vel.x * self.phys_attrs.dampen if dx else self.vel.x,
-                     self.vel.y * self.phys_attrs.dampen if dy else self.vel.y)
-        if self.vel.length() < DAMP_THRESHOLD:
+        self.vel.set(self.vel.x * self.dampen_factor if dx else self.vel.x,
+                     self.vel.y * self.dampen_factor if dy else self.vel.y)
+        if self.vel.lengthSq() < DAMP_THRESHOLD * DAMP_THRESHOLD:
             self.vel.clear()
 
     def stop(self, dx=True, dy=True):
-        self.vel = Vector(0 if dx else self.vel.x, 0 if dy else self.vel.y)
+        # mutate in place; this runs on every teleport/collision response
+        # and the axes are just being conditionally zeroed
+        if dx:
+            self.vel.x = 0
+        if dy:
+            self.vel.y = 0
         self.accel.clear()
 
     def isMoving(self):
-        return self.vel.length() > 0
+        return not self.vel.empty()
 
     def size(self):
-        return self.phys_attrs.radius
+        return self.radius
 
     def getBounds(self):
-        return Circle(self.pos, self.phys_attrs.radius)
-
-    def __getattr__(self, attr):
-        return getattr(self.phys_attrs, attr)
+        return Circle(self.pos, self.radius)
 
 #end PhysicsEntity
+
+
+class PhysicsWorld:
+    """ Structure-of-arrays batch of physics bodies.
+
+    Holds position/velocity/acceleration for all bodies in contiguous
+    numpy arrays and advances them with a handful of vectorized ops in
+    step(), instead of one Python update() per entity. Use for scenes
+    with many simple bodies; PhysicsEntity remains for one-off objects.
+    """
+
+    def __init__(self, capacity = 64):
+        if not np:
+            raise ImportError("PhysicsWorld requires numpy")
+
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.accel = np.zeros((capacity, 2), dtype=np.float32)
+        self.max_vel = np.zeros(capacity, dtype=np.float32)
+        self.mass = np.zeros(capacity, dtype=np.float32)
+
+    def add(self, position, phys_attributes):
+        """ Register a body, returning its index into the arrays. """
+        if self.count == len(self.pos):
+            self._grow()
+
+        idx = self.count
+        self.pos[idx] = (position[0], position[1])
+        self.vel[idx] = self.accel[idx] = (0.0, 0.0)
+        self.max_vel[idx] = phys_attributes.max_vel
+        self.mass[idx] = phys_attributes.mass
+        self.count += 1
+        return idx
+
+    def step(self, time_step):
+        n = self.count
+        vel = self.vel[:n]
+        vel += self.accel[:n] * time_step
+
+        # Enforce velocity cap across all bodies at once
+        speed = np.sqrt((vel*vel).sum(axis=1))
+        mask = speed > self.max_vel[:n]
+        if mask.any():
+            vel[mask] *= (self.max_vel[:n][mask] / speed[mask])[:, None]
+
+        self.pos[:n] += vel * time_step
+
+    def applyForce(self, idx, force):
+        self.vel[idx] += (force[0]/self.mass[idx], force[1]/self.mass[idx])
+
+    def getPosition(self, idx):
+        return Vector(*self.pos[idx])
+
+    def _grow(self):
+        for name in ("pos", "vel", "accel", "max_vel", "mass"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate((arr, np.zeros_like(arr))))
+
+#end PhysicsWorld
@@ -15,31 +15,64 @@ class TriggerManager(object):
 	def __init__(self, gc):
 		self.gc = gc
 		self.triggers = []
+		self.timer_pool = TimerPool()
+		self.proximity_index = ProximityIndex()
 
 
 	def update(self, dt):
-		# Erase triggers as they trigger
-		self.triggers = [x for x in self.triggers if not (x.update(dt) and x.autoremove)]
+		# Erase triggers as they trigger. Swap-with-last keeps this
+		# allocation-free every frame; trigger order is not significant.
+		trigs = self.triggers
+		i = 0
+		while i < len(trigs):
+			t = trigs[i]
+			if t.update(dt) and t.autoremove:
+				trigs[i] = trigs[-1]
+				trigs.pop()
+			else:
+				i += 1
+
+		if self.timer_pool.times:
+			self.timer_pool.update(dt)
+
+		if self.proximity_index.triggers:
+			self.proximity_index.update(dt)
 
 
 	def addTrigger(self, trigger, autoremove = True):
-		self.triggers.append(trigger)
 		trigger.tmgr = self
+		if isinstance(trigger, Proximity):
+			# Proximity triggers go through the grid broad phase
+			self.proximity_index.add(trigger)
+		else:
+			self.triggers.append(trigger)
 		return trigger
 
 
 	def removeTrigger(self, trigger):
-		self.triggers.remove(trigger)
+		if isinstance(trigger, Proximity):
+			self.proximity_index.remove(trigger)
+		else:
+			self.triggers.remove(trigger)
 
 	def clearTriggers(self, ttype=None):
 		if ttype:
 			self.triggers = [x for x in self.triggers if not isinstance(x, ttype)]
+			# filter the index by the same isinstance test; ttype may be a
+			# Proximity subclass or only match some of the indexed triggers
+			index = self.proximity_index
+			for trig in [t for t in index.triggers if isinstance(t, ttype)]:
+				index.remove(trig)
 		else:
 			self.triggers.clear()
+			self.proximity_index.clear()
 
 	def addTimer(self, delay, callback, recurring = False):
 		return self.addTrigger(Timer(delay, callback, recurring))
 
+	def addPooledTimer(self, delay, callback, recurring = False):
+		self.timer_pool.add(delay, callback, recurring)
+
 #end TriggerManager
 
 
@@ -113,6 +146,68 @@ class Timer(Trigger):
 
 #end Timer
 
+###############################################################################
+##  TimerPool
+
+class TimerPool(object):
+	""" Structure-of-arrays batch of lightweight timers.
+
+	Keeps time/delay/recurring/callback in parallel lists and advances
+	every timer in one fused loop, instead of one Timer object and one
+	update() call apiece. Pooled timers are anonymous: callbacks receive
+	the pool, and expired one-shots are swap-erased in place.
+	"""
+
+	def __init__(self):
+		self.times = []
+		self.delays = []
+		self.recurring = []
+		self.callbacks = []
+
+	def add(self, delay, callback, recurring = False):
+		self.times.append(0.0)
+		self.delays.append(delay)
+		self.recurring.append(recurring)
+		self.callbacks.append(callback)
+
+	def update(self, dt):
+		times = self.times
+		delays = self.delays
+		recurring = self.recurring
+		callbacks = self.callbacks
+		i = 0
+		n = len(times)
+		while i < n:
+			t = times[i] + dt
+			if t < delays[i]:
+				times[i] = t
+				i += 1
+				continue
+
+			callbacks[i](self)
+			if recurring[i]:
+				times[i] = 0.0
+				i += 1
+			else:
+				# swap-erase from the live end: the callback may have
+				# add()ed timers, so the cached bound is stale. The
+				# swapped-in timer gets processed next pass.
+				last = len(times) - 1
+				times[i] = times[last]
+				delays[i] = delays[last]
+				recurring[i] = recurring[last]
+				callbacks[i] = callbacks[last]
+				times.pop()
+				delays.pop()
+				recurring.pop()
+				callbacks.pop()
+				n = last
+
+	def __len__(self):
+		return len(self.times)
+
+#end TimerPool
+
 ###############################################################################
 ##  Proximity
 
@@ -134,4 +229,75 @@ class Proximity(Trigger):
 			self.reset()
 		return False
 
-#end ProximityTrigger
\ No newline at end of file
+#end ProximityTrigger
+
+###############################################################################
+##  ProximityIndex
+
+class ProximityIndex(object):
+	""" Uniform-grid broad phase for Proximity triggers.
+
+	Each trigger's bounding volume is bucketed into the grid cells it
+	overlaps at add() time. Per frame, the narrow contains() test only
+	runs for triggers whose entity currently sits in one of their
+	cells; everything else is skipped with a set lookup. Triggers that
+	have fired keep getting the narrow test so they reset on leave.
+	"""
+	from .primitives import Circle
+
+	def __init__(self, cell_size = 128):
+		self.cell_size = cell_size
+		self.grid = {}
+		self.triggers = []
+		self._cells = {}
+
+	def add(self, trigger):
+		self.triggers.append(trigger)
+		cells = self._volumeCells(trigger.bound_vol)
+		self._cells[id(trigger)] = cells
+		for cell in cells:
+			self.grid.setdefault(cell, []).append(trigger)
+
+	def remove(self, trigger):
+		self.triggers.remove(trigger)
+		for cell in self._cells.pop(id(trigger)):
+			bucket = self.grid[cell]
+			bucket.remove(trigger)
+			if not bucket:
+				del self.grid[cell]
+
+	def clear(self):
+		self.grid.clear()
+		self.triggers.clear()
+		self._cells.clear()
+
+	def candidates(self, pos):
+		""" Triggers whose volume overlaps the cell containing pos. """
+		cs = self.cell_size
+		return self.grid.get((int(pos[0] // cs), int(pos[1] // cs)), [])
+
+	def update(self, dt):
+		cs = self.cell_size
+		cells = self._cells
+		for trig in self.triggers:
+			if trig.triggered:
+				# narrow test regardless, to reset on leave
+				trig.update(dt)
+				continue
+			pos = trig.entity.pos
+			if (int(pos[0] // cs), int(pos[1] // cs)) in cells[id(trig)]:
+				trig.update(dt)
+
+	def _volumeCells(self, vol):
+		cs = self.cell_size
+		left, top = vol.pos[0], vol.pos[1]
+		if isinstance(vol, ProximityIndex.Circle):
+			left -= vol.radius
+			top -= vol.radius
+		right = left + vol.width()
+		bottom = top + vol.height()
+		return frozenset((cx, cy)
+		                 for cx in range(int(left // cs), int(right // cs) + 1)
+		                 for cy in range(int(top // cs), int(bottom // cs) + 1))
+
+#end ProximityIndex
\ No newline at end of file
@@ -16,6 +16,13 @@ from pygame.locals import *
 from djlib.utils import enum, flags
 import logging
 
+# numpy is optional; bulk child hit-testing falls back to the plain
+# per-child loop without it.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 log = logging.getLogger(__name__)
 
 
@@ -31,6 +38,35 @@ Events = enum(
     END_ID = 1236
 )
 
+# O(1) membership for keystroke filtering; `in string.printable` scans
+# the 100-char string on every KEYDOWN.
+_PRINTABLE = frozenset(string.printable)
+
+# Fonts shared by every Theme instance, keyed (name, size).
+_FONT_CACHE = {}
+
+# Scaled image copies shared across widgets, keyed (source, size) —
+# Surfaces hash by identity — so the same sprite reused at the same
+# bounds is only scaled once. Keying on the Surface itself (not its id)
+# means a recycled id can never hand back another image's pixels; the
+# small cap bounds how many sources the cache keeps alive.
+_SCALED_CACHE_MAX = 64
+_SCALED_CACHE = {}
+
+def _scaleImage(image, size):
+    key = (image, tuple(size))
+    scaled = _SCALED_CACHE.get(key)
+    if scaled is None:
+        scaled = pg.transform.scale(image, size)
+        if pg.display.get_surface():
+            scaled = scaled.convert_alpha()
+        if len(_SCALED_CACHE) >= _SCALED_CACHE_MAX:
+            _SCALED_CACHE.clear()
+        _SCALED_CACHE[key] = scaled
+    return scaled
+#end _scaleImage
+
+
 class Theme(object):
     """
     Base Theme acting as a Base Class for all other themes.
@@ -53,10 +89,22 @@ class Theme(object):
 
     FONT = None # Delay font creation until first text
     FONT_COLOR = pg.Color(255, 255, 255)
+    _font_render = None # bound FONT.render, refreshed whenever FONT changes
+
+    PADDING = 0
+
+    # Rendered-text surfaces keyed (text, font, color); font rasterization
+    # is the most expensive per-frame UI op and labels rarely change.
+    _TEXT_CACHE_MAX = 512
+    _text_cache = {}
 
-    PADDING = 0 
+    # Layout offsets keyed (rect size, text size, flags, padding); static
+    # labels recompute no centering/padding math on redraws.
+    _LAYOUT_CACHE_MAX = 512
+    _layout_cache = {}
 
-    _font_cache = {}
+    # Active draw batch, or None for immediate mode
+    _batch = None
 
     def drawFrame(self, surf, rect):
         raise NotImplemented()
@@ -73,49 +121,170 @@ class Theme(object):
     def drawProgress(self, surf, rect, progress, steps):
         raise NotImplemented()
 
+    def beginBatch(self):
+        """ Start collecting rect draws instead of issuing them one by
+            one. Until endBatch(), _drawRect queues (surf, color, rect,
+            width) tuples; widgets render to their own surfaces, so each
+            entry records its target. Immediate ops (text, images) flush
+            the queue first so queued fills never paint over them. """
+        self._batch = []
+
+    def endBatch(self):
+        """ Replay any remaining queued rect draws in order. """
+        batch, self._batch = self._batch, None
+        if batch:
+            self._replayBatch(batch)
+
+    def _flushBatch(self):
+        # drawText/drawImage blit immediately; pending rects must land
+        # underneath them, not on top at endBatch
+        batch = self._batch
+        if batch:
+            self._replayBatch(batch)
+            del batch[:]
+
+    def _replayBatch(self, batch):
+        """ Solid rects go through Surface.fill, which is cheaper than
+            pg.draw.rect for axis-aligned fills; bordered rects stay
+            individual draw calls. """
+        draw = pg.draw.rect
+        for surf, color, rect, width in batch:
+            if width:
+                draw(surf, color, rect, width)
+            else:
+                surf.fill(color, rect)
+
+    def _drawRect(self, surf, color, rect, width):
+        batch = self._batch
+        if batch is not None:
+            batch.append((surf, color, rect, width))
+        elif width:
+            pg.draw.rect(surf, color, rect, width)
+        else:
+            surf.fill(color, rect)
+
+    @property
+    def font(self):
+        """ Lazily materialized FONT; first access resolves the shared
+            default font and binds its render method. """
+        return self.FONT or self._ensureFont()
+
     def drawText(self, surf, rect, text, flags_=0):
-        if not self.FONT:
-            self.FONT = self.generateFont("default", None, self.DEFAULT_FONT_SIZE)
+        if not self.font:
+            return 0
+
+        if self._batch:
+            self._flushBatch()
 
         texts = text.split("\n")
-        rect = rect.copy()
+        cache = Theme._layout_cache
+        x, y = rect.x, rect.y
+        w, h = rect.width, rect.height
 
         for text in texts:
-            text_surf = self.FONT.render(text, True, self.FONT_COLOR)
-
-            if flags_ & Theme.Format.PAD_FULL:
-                rect = rect.inflate(-self.PADDING if flags_ & self.Format.PAD_HORZ else 0,
-                                    -self.PADDING if flags_ & self.Format.PAD_VERT else 0)
-            pos = rect.topleft
-            if flags_ & Theme.Format.CENTER_FULL:
-                pos = (pos[0] + ((rect.width-text_surf.get_width())/2 if flags_ & self.Format.CENTER_HORZ else 0),
-                       pos[1] + ((rect.height-text_surf.get_height())/2 if flags_ & self.Format.CENTER_VERT else 0))
-
-            surf.blit(text_surf, pos)
-            rect.y += text_surf.get_height()
+            text_surf = self._renderText(text)
+            th = text_surf.get_height()
+
+            key = (w, h, text_surf.get_width(), th, flags_, self.PADDING)
+            layout = cache.get(key)
+            if layout is None:
+                layout = self._layoutText(key)
+                if len(cache) >= self._LAYOUT_CACHE_MAX:
+                    cache.clear()
+                cache[key] = layout
+
+            surf.blit(text_surf, (x + layout[0], y + layout[1]))
+            x += layout[2]
+            y += layout[3] + th
+            w, h = layout[4], layout[5]
 
         return text_surf.get_width()
 
+    def _layoutText(self, key):
+        """ Padding/centering math for one line, relative to the rect's
+            topleft: (blit offset x/y, rect shift x/y, new rect size).
+            Plain integer arithmetic; same results as the old
+            Rect.inflate path without allocating a Rect. """
+        w, h, tw, th, flags_, pad = key
+        sx = sy = 0
+        if flags_ & _FMT_PAD_FULL:
+            if flags_ & _FMT_PAD_HORZ:
+                sx = pad >> 1
+                w -= pad
+            if flags_ & _FMT_PAD_VERT:
+                sy = pad >> 1
+                h -= pad
+        ox, oy = sx, sy
+        if flags_ & _FMT_CENTER_FULL:
+            if flags_ & _FMT_CENTER_HORZ:
+                ox = sx + (w-tw)/2
+            if flags_ & _FMT_CENTER_VERT:
+                oy = sy + (h-th)/2
+        return (ox, oy, sx, sy, w, h)
+
+    def _ensureFont(self):
+        """ Resolve FONT and bind its render method once, instead of
+            re-checking in every draw call. Safe to call before the
+            font module is up; drawText retries until it is. """
+        if not self.FONT and pg.font.get_init():
+            self.FONT = self.generateFont("default", None, self.DEFAULT_FONT_SIZE)
+        if self.FONT:
+            self._font_render = self.FONT.render
+        return self.FONT
+
+    def _renderText(self, text):
+        key = (text, self.FONT, tuple(self.FONT_COLOR))
+        surf = self._text_cache.get(key)
+        if surf is None:
+            render = self._font_render
+            if render is None or render.__self__ is not self.FONT:
+                # FONT can be assigned directly (or set on a subclass)
+                # without going through selectFont/_ensureFont; rebind
+                # instead of calling a stale or missing method
+                render = self._font_render = self.FONT.render
+            surf = render(text, True, self.FONT_COLOR)
+            if pg.display.get_surface():
+                # match the display format once; every later blit of the
+                # cached surface skips the per-pixel conversion
+                surf = surf.convert_alpha()
+            if len(self._text_cache) >= self._TEXT_CACHE_MAX:
+                self._text_cache.clear()
+            self._text_cache[key] = surf
+        return surf
+
     def generateFont(self, name, face=None, size=12):
-        font = self._font_cache.get(name, None)
-        face = face if face else pg.font.get_default_font()
+        # fonts are shared across all Theme instances; one FreeType
+        # allocation per (name, size)
+        font = _FONT_CACHE.get((name, size), None)
 
         if not font:
+            face = face if face else pg.font.get_default_font()
             font = pg.font.Font(face, size)
-            self._font_cache[name] = font
+            _FONT_CACHE[(name, size)] = font
         return font
 
     def selectFont(self, name, color=(255,255,255)):
-        font = self._font_cache.get(name, None)
-        if font:
-            self.FONT = font
-            self.FONT_COLOR = color
-            return True
+        for (fname, _), font in _FONT_CACHE.items():
+            if fname == name:
+                self.FONT = font
+                self._font_render = font.render
+                self.FONT_COLOR = color
+                return True
         return False
 
 #end Theme
 
 
+# Hot Format flags as module constants; the per-frame layout code pays
+# one global load instead of a class-attribute walk per flag.
+_FMT_CENTER_HORZ = Theme.Format.CENTER_HORZ
+_FMT_CENTER_VERT = Theme.Format.CENTER_VERT
+_FMT_CENTER_FULL = Theme.Format.CENTER_FULL
+_FMT_PAD_HORZ = Theme.Format.PAD_HORZ
+_FMT_PAD_VERT = Theme.Format.PAD_VERT
+_FMT_PAD_FULL = Theme.Format.PAD_FULL
+
+
 class ColorTheme(Theme):
 
     # Frame Colors
@@ -133,13 +302,15 @@ class ColorTheme(Theme):
     PB_BORDER = 2
 
     def drawFrame(self, surf, rect):
-        pg.draw.rect(surf, self.BG_COLOR, rect, 0)
+        self._drawRect(surf, self.BG_COLOR, rect, 0)
 
     def drawButton(self, surf, rect, state):
-        pg.draw.rect(surf, self.BUT_COLORS[state], rect, 0)
-        pg.draw.rect(surf, self.BEV_COLOR, rect, self.BEV_SIZES[state])
+        self._drawRect(surf, self.BUT_COLORS[state], rect, 0)
+        self._drawRect(surf, self.BEV_COLOR, rect, self.BEV_SIZES[state])
 
     def drawImage(self, surf, rect, image):
+        if self._batch:
+            self._flushBatch()
         surf.blit(image, rect)
 
     def drawInput(self, surf, rect):
@@ -148,8 +319,8 @@ class ColorTheme(Theme):
     def drawProgress(self, surf, rect, progress, steps):
         fprogress = float(progress)/steps
         prect = pg.Rect(rect.x, rect.y, rect.width * fprogress, rect.height)
-        pg.draw.rect(surf, self.PB_COLOR, rect, self.PB_BORDER)
-        pg.draw.rect(surf, self.PB_COLOR, prect, 0)
+        self._drawRect(surf, self.PB_COLOR, rect, self.PB_BORDER)
+        self._drawRect(surf, self.PB_COLOR, prect, 0)
 
 #end ColorTheme
 
@@ -159,6 +330,7 @@ _THEME = ColorTheme()
 def setTheme(theme):
     global _THEME
     if theme != _THEME:
+        theme._ensureFont()
         _THEME = theme
 
 #end setTheme
@@ -166,48 +338,173 @@ def setTheme(theme):
 
 class Frame(object):
 
+    # Widgets that never react to mouse events set this False so event
+    # routing skips them without the virtual call.
+    ACCEPTS_MOUSE = True
+
     def __init__(self, bounds):
         self.bounds = bounds.copy() if isinstance(bounds, pg.Rect) else pg.Rect(*bounds)
         self.parent = None
         self.visible = True
         self.dirty = True
-        #self.children = []
+        self._cache = None
+        self._abs_rect = None
+        self._child_sides = None
+        # Rect generations: children lazily recompute their absolute
+        # rect when their parent's generation moves on, instead of an
+        # eager recursive invalidation walk.
+        self._rect_gen = 0
+        self._parent_gen = -1
+        self.children = []
 
     def render(self, surf):
-        self.dirty = False
         if not self.visible:
             return
 
-        _THEME.drawFrame(surf, self.getRect())
-        self._delegate('render', surf)
+        # Clean subtree: one blit of the cached composite, no tree walk
+        if not self.dirty and self._cache:
+            surf.blit(self._cache, self.getRect().topleft)
+            return
+
+        # Recompose the subtree into the cache. Temporarily making this
+        # frame the origin lets children render with their usual getRect.
+        cache = self._cache
+        if cache is not None and cache.get_size() == self.bounds.size:
+            cache.fill((0, 0, 0, 0)) # reuse the surface, skip the alloc
+        else:
+            cache = pg.Surface(self.bounds.size, pg.SRCALPHA)
+        tb, tp = self.bounds, self.parent
+        self.bounds, self.parent = pg.Rect(0, 0, tb.width, tb.height), None
+        # bump generation so children re-resolve against the origin now
+        # and against the real position on their next outside access
+        self._invalidateRect()
+        _THEME.drawFrame(cache, self.bounds)
+        self._delegate('render', cache)
+        self.bounds, self.parent = tb, tp
+        self._invalidateRect()
+
+        self._cache = cache
+        self.dirty = False
+        surf.blit(cache, self.getRect().topleft)
 
     def processEvent(self, event):
-        # Only mouse events 
-        if hasattr(event, 'pos') and not self.getRect().collidepoint(event.pos):
-            return False
+        # Only mouse events
+        if hasattr(event, 'pos'):
+            if not self.getRect().collidepoint(event.pos):
+                return False
+            return self._routeMouse(event)
         return self._delegate('processEvent', event)
 
+    def _routeMouse(self, event):
+        # Hit-test every plain-container child with one numpy mask and
+        # skip the misses; they would only reject the event themselves.
+        # Widgets that override processEvent (buttons tracking hover-out,
+        # edit boxes defocusing on outside clicks) always get the event.
+        children = self.children
+        if not children:
+            return False
+        if np is None:
+            for c in children:
+                if c.ACCEPTS_MOUSE and c.processEvent(event):
+                    return True
+            return False
+
+        sides, gated = self._gatedChildSides()
+        if not gated:
+            for c in children:
+                if c.ACCEPTS_MOUSE and c.processEvent(event):
+                    return True
+            return False
+
+        x, y = event.pos
+        # same inclusive/exclusive edges as Rect.collidepoint
+        hit = (x >= sides[:, 0]) & (y >= sides[:, 1]) & \
+              (x < sides[:, 2]) & (y < sides[:, 3])
+        row = 0
+        for i, c in enumerate(children):
+            if row < len(gated) and gated[row] == i:
+                skip = not hit[row]
+                row += 1
+                if skip:
+                    continue
+            if c.ACCEPTS_MOUSE and c.processEvent(event):
+                return True
+        return False
+
+    def _gatedChildSides(self):
+        cached = self._child_sides
+        if cached is None:
+            gated = [i for i, c in enumerate(self.children)
+                     if type(c).processEvent is Frame.processEvent]
+            sides = np.empty((len(gated), 4), dtype=np.float64)
+            for row, i in enumerate(gated):
+                r = self.children[i].getRect()
+                sides[row] = (r.left, r.top, r.right, r.bottom)
+            cached = self._child_sides = (sides, gated)
+        return cached
+
     def getRect(self):
-        return self.bounds.move(*self.parent.getRect().topleft) if self.parent else self.bounds
+        # Cached; rebuilding via Rect.move on every render/event call adds
+        # an allocation per widget per frame. The generation check makes
+        # a stale parent rect propagate lazily down the tree.
+        parent = self.parent
+        if parent is None:
+            return self.bounds
+
+        prect = parent.getRect()
+        if self._abs_rect is None or self._parent_gen != parent._rect_gen:
+            self._parent_gen = parent._rect_gen
+            rect = self.bounds.move(prect.left, prect.top)
+            if self._abs_rect is None or rect.topleft != self._abs_rect.topleft \
+                    or rect.size != self._abs_rect.size:
+                self._abs_rect = rect
+                self._rect_gen += 1
+                self._child_sides = None
+        return self._abs_rect
 
     def addChild(self, child):
         assert(isinstance(child, Frame))
-        if not hasattr(self, 'children'):
-            self.children = []
         self.children.append(child)
         child.parent = self
+        child._invalidateRect()
+        self._child_sides = None
         return child
 
     def redraw(self):
         self.dirty = True
+        self._abs_rect = None
         if self.parent:
             self.parent.redraw()
 
+    def _collectDirty(self, rects=None):
+        """ Absolute rects of the deepest dirty subtrees, suitable for
+            pg.display.update after rendering. Dirtiness propagates up
+            through redraw(), so ancestors recurse toward the children
+            that actually changed. Call before render() clears flags. """
+        if rects is None:
+            rects = []
+        children = self.children
+        if children:
+            before = len(rects)
+            for c in children:
+                c._collectDirty(rects)
+            if len(rects) != before:
+                return rects
+        if self.dirty:
+            rects.append(self.getRect())
+        return rects
+
+    def _invalidateRect(self):
+        # O(1): descendants notice the generation change on their next
+        # getRect instead of being walked eagerly.
+        self._abs_rect = None
+        self._child_sides = None
+        self._rect_gen += 1
+
     def _delegate(self, call, *args, **kargs):
-        if hasattr(self, 'children') and self.children:
-            for c in self.children:
-                if getattr(c, call)(*args, **kargs):
-                    return True
+        for c in self.children:
+            if getattr(c, call)(*args, **kargs):
+                return True
         return False
 
     def _debugTree(self, depth = 0):
@@ -220,6 +517,8 @@ class Frame(object):
 
 class Text(Frame):
 
+    ACCEPTS_MOUSE = False # labels never consume mouse events
+
     def __init__(self, bounds, text="", centered = False):
         Frame.__init__(self, bounds)
         self.text = text
@@ -244,15 +543,26 @@ class Image(Frame):
     def __init__(self, bounds, image, keep_ratio=True):
         Frame.__init__(self, bounds)
         self.image = None
+        self._raw_image = None
+        self._keep_ratio = keep_ratio
         if image:
             self.setImage(image, keep_ratio)
 
     def setImage(self, image, keep_ratio=True):
-        if self.image == image:
+        if self._raw_image == image and keep_ratio == self._keep_ratio:
             return
 
+        # Defer the scale to the first visible render; Images built
+        # offscreen (or never shown) don't pay for it at startup.
+        self._raw_image = image
+        self._keep_ratio = keep_ratio
+        self.image = None
+        self.redraw()
+
+    def _performScale(self):
+        image = self._raw_image
         new_size = self.bounds.size
-        if keep_ratio:
+        if self._keep_ratio:
             img_ratio = float(image.get_width()) / image.get_height()
             bnd_ratio = float(self.bounds.width) / self.bounds.height
 
@@ -263,11 +573,12 @@ class Image(Frame):
 
         self.image = image
         if new_size[0] != image.get_width() or new_size[1] != image.get_height():
-            self.image = pg.transform.scale(image, new_size)
-        self.redraw()
+            self.image = _scaleImage(image, new_size)
 
     def render(self, surf):
-        if self.image:
+        if self._raw_image:
+            if self.image is None:
+                self._performScale()
             _THEME.drawImage(surf, self.getRect(), self.image)
 
 # end Image
@@ -287,35 +598,58 @@ class Button(Frame):
         self.key = key
 
     def render(self, surf):
-        _THEME.drawButton(surf, self.getRect(), self.state)
-        _THEME.drawText(surf, self.getRect(), self.text, Theme.Format.CENTER_FULL)
+        theme = _THEME
+        rect = self.getRect()
+        theme.drawButton(surf, rect, self.state)
+        theme.drawText(surf, rect, self.text, Theme.Format.CENTER_FULL)
 
     def processEvent(self, event):
+        # One (state, event type) table lookup replaces the old branch
+        # cascade run for every event on every button.
+        fn = Button._getTransition((self.state, event.type))
+        return fn(self, event) if fn else False
+
+    def _evMotion(self, event):
         # Moving into or out of button
-        if event.type == MOUSEMOTION:
-            if self.getRect().collidepoint(event.pos):
-                if not self.state == Button.DOWN:
-                    self._changeState(Button.HOVER)
-                    return True
-            elif not self.state == Button.UP:
-                self._changeState(Button.UP)
-        elif event.type == KEYDOWN and event.key == self.key:
-            self._changeState(Button.DOWN)
-        elif self.state == Button.HOVER:
-            # If state is already HOVER, always assume mouse is in Rect
-            if event.type == MOUSEBUTTONDOWN:
-                self._changeState(Button.DOWN)
-                return True
-        elif self.state == Button.DOWN:
-            if event.type == MOUSEBUTTONUP:
+        if self.getRect().collidepoint(event.pos):
+            if not self.state == Button.DOWN:
                 self._changeState(Button.HOVER)
                 return True
-            elif event.type == KEYUP and event.key == self.key:
-                self._changeState(Button.UP)
-                return True
+        elif not self.state == Button.UP:
+            self._changeState(Button.UP)
+        return False
 
+    def _evKeyDown(self, event):
+        if event.key == self.key:
+            self._changeState(Button.DOWN)
+        return False
+
+    def _evPress(self, event):
+        # Already HOVER, so assume mouse is in Rect
+        self._changeState(Button.DOWN)
+        return True
+
+    def _evRelease(self, event):
+        self._changeState(Button.HOVER)
+        return True
+
+    def _evKeyUp(self, event):
+        if event.key == self.key:
+            self._changeState(Button.UP)
+            return True
         return False
 
+    _TRANSITIONS = {(UP, MOUSEMOTION): _evMotion,
+                    (HOVER, MOUSEMOTION): _evMotion,
+                    (DOWN, MOUSEMOTION): _evMotion,
+                    (UP, KEYDOWN): _evKeyDown,
+                    (HOVER, KEYDOWN): _evKeyDown,
+                    (DOWN, KEYDOWN): _evKeyDown,
+                    (HOVER, MOUSEBUTTONDOWN): _evPress,
+                    (DOWN, MOUSEBUTTONUP): _evRelease,
+                    (DOWN, KEYUP): _evKeyUp}
+    _getTransition = _TRANSITIONS.get
+
     def _changeState(self, new_state):
         if self.state == new_state:
             return
@@ -340,17 +674,27 @@ class ImageButton(Button):
 
     def __init__(self, bounds, name, image, callback=None, key=None, image_hover=None, image_down=None):
         Button.__init__(self, bounds, name, callback, key)
-        self.images = {}
         self.setImages(image, image_hover, image_down)
 
     def setImages(self, image_up, image_hover=None, image_down=None):
-        self.images[Button.UP] = image_up
-        self.images[Button.HOVER] = image_hover
-        self.images[Button.DOWN] = image_down
+        # Scale each state image to the button once and resolve the
+        # UP fallbacks now; render indexes a plain 3-tuple by state.
+        up = self._prepImage(image_up)
+        self._images = (up,
+                        self._prepImage(image_hover) or up,
+                        self._prepImage(image_down) or up)
+
+    def _prepImage(self, image):
+        if not image:
+            return None
+        if image.get_size() != self.bounds.size:
+            return _scaleImage(image, self.bounds.size)
+        if pg.display.get_surface():
+            image = image.convert_alpha()
+        return image
 
     def render(self, surf):
-        img = self.images.get(self.state)
-        _THEME.drawImage(surf, self.getRect(), img if img else self.images[Button.UP])
+        _THEME.drawImage(surf, self.getRect(), self._images[self.state])
 
 # end ImageButton
 
@@ -365,11 +709,12 @@ class CheckBox(Button):
         rect = self.getRect()
         check_rect = pg.Rect(rect.topleft, (rect.height, rect.height))
         state = Button.DOWN if self.checked else self.state
-        _THEME.drawButton(surf, check_rect, state)
+        theme = _THEME
+        theme.drawButton(surf, check_rect, state)
         if self.checked:
-            _THEME.drawText(surf, check_rect, "X", Theme.Format.CENTER_FULL)
+            theme.drawText(surf, check_rect, "X", Theme.Format.CENTER_FULL)
         rect = pg.Rect(check_rect.topright, (rect.width-check_rect.width, rect.height))
-        _THEME.drawText(surf, rect, self.text, Theme.Format.CENTER_VERT)
+        theme.drawText(surf, rect, self.text, Theme.Format.CENTER_VERT)
 
 #end CheckBox
 
@@ -378,17 +723,66 @@ class EditBox(Frame):
 
     def __init__(self, bounds, text="", callback=None):
         Frame.__init__(self, bounds)
-        self.text = text
+        # Gap buffer around the cursor: inserting or deleting a char is
+        # an O(1) list op instead of rebuilding the whole string. _right
+        # is reversed so both sides edit at their tail. The joined string
+        # is cached until the next edit.
+        self._left = []
+        self._right = list(text)
+        self._right.reverse()
+        self._text = text
+        # cursor pixel offset, keyed by (pos, text, font) so it only
+        # remeasures after an actual edit or cursor move
+        self._cursor_key = None
+        self._cursor_x = 0
         self.focused = False
         self.callback = callback
-        self.selPos = 0
+
+    @property
+    def text(self):
+        text = self._text
+        if text is None:
+            text = self._text = ''.join(self._left) + ''.join(reversed(self._right))
+        return text
+
+    @text.setter
+    def text(self, text):
+        self.setText(text)
+
+    @property
+    def selPos(self):
+        return len(self._left)
+
+    @selPos.setter
+    def selPos(self, pos):
+        left, right = self._left, self._right
+        n = len(left) + len(right)
+        pos = 0 if pos < 0 else (n if pos > n else pos)
+        while len(left) > pos:
+            right.append(left.pop())
+        while len(left) < pos:
+            left.append(right.pop())
 
     def render(self, surf):
-        text = self.text
-        if self.focused:
-            text = self.text[:self.selPos]+"|"+self.text[self.selPos:]
-        _THEME.drawInput(surf, self.getRect())
-        _THEME.drawText(surf, self.getRect(), text, Theme.Format.CENTER_VERT | Theme.Format.PAD_HORZ)
+        # The cursor is blitted as a separate overlay on top of the
+        # cached base-text surface; splicing "|" into the string would
+        # re-rasterize the whole line on every cursor move.
+        theme = _THEME
+        rect = self.getRect()
+        theme.drawInput(surf, rect)
+        theme.drawText(surf, rect, self.text, Theme.Format.CENTER_VERT | Theme.Format.PAD_HORZ)
+        if self.focused and theme.font:
+            cursor = theme._renderText("|")
+            x = rect.x + (theme.PADDING >> 1) + self._cursorOffset(theme)
+            y = rect.y + (rect.height - cursor.get_height())/2
+            surf.blit(cursor, (x, y))
+
+    def _cursorOffset(self, theme):
+        key = (len(self._left), self.text, theme.FONT)
+        if self._cursor_key != key:
+            self._cursor_key = key
+            self._cursor_x = theme.FONT.size(key[1][:key[0]])[0]
+        return self._cursor_x
 
     def processEvent(self, event):
         if event.type == MOUSEBUTTONDOWN:
@@ -406,14 +800,15 @@ class EditBox(Frame):
                 self.setCursor(self.selPos - 1)
             elif event.key == K_RIGHT:
                 self.setCursor(self.selPos + 1)
-            elif event.key == K_BACKSPACE and self.selPos > 0:
-                self.selPos -= 1
-                self.setText(self.text[:self.selPos]+self.text[self.selPos+1:])
+            elif event.key == K_BACKSPACE and self._left:
+                self._left.pop()
+                self._text = None
+                self.redraw()
             elif event.key == K_RETURN:
                 self._notify()
-            elif event.unicode and event.unicode in string.printable:
-                self.text = self.text[:self.selPos]+event.unicode+self.text[self.selPos:]
-                self.selPos += 1
+            elif event.unicode and event.unicode in _PRINTABLE:
+                self._left.append(event.unicode)
+                self._text = None
                 self.redraw()
             return True
 
@@ -421,9 +816,13 @@ class EditBox(Frame):
         if text == self.text:
             return
 
-        self.text = text
-        if self.focused and self.selPos > len(self.text):
-            self.selPos = len(self.text)
+        pos = len(self._left)
+        if pos > len(text):
+            pos = len(text)
+        self._left = list(text[:pos])
+        self._right = list(text[pos:])
+        self._right.reverse()
+        self._text = text
         self.redraw()
 
     def setFocus(self, focus):
@@ -435,12 +834,13 @@ class EditBox(Frame):
 
     def setCursor(self, pos):
         # Bounds Check
+        n = len(self._left) + len(self._right)
         if pos < 0:
             pos = 0
-        elif pos > len(self.text):
-            pos = len(self.text)
+        elif pos > n:
+            pos = n
 
-        if pos != self.selPos:
+        if pos != len(self._left):
             self.selPos = pos
             self.redraw()
 
@@ -469,29 +869,63 @@ class View(Frame):
 
     def __init__(self, bounds, background = None):
         Frame.__init__(self, bounds)
-        self.surf = pg.Surface(self.bounds.size)
-        self.bg = background
-        if background.get_width() != self.bounds.width or background.get_height() != self.bounds.height:
-            self.bg = pg.transform.scale(background, self.bounds.size)
+        # Surface and scaled background are allocated on the first
+        # visible render; views that never show cost nothing.
+        self.surf = None
+        self.bg = None
+        self._bg_raw = background
         self.dirty = True
+        self._painted = False
 
     def render(self, surf):
         # Don't render if not visible, but keep dirty status
         if not self.visible:
             return
 
+        if self.surf is None:
+            vsurf = pg.Surface(self.bounds.size)
+            if pg.display.get_surface():
+                vsurf = vsurf.convert_alpha()
+            self.surf = vsurf
+            bg = self._bg_raw
+            if bg is not None:
+                if bg.get_width() != self.bounds.width or bg.get_height() != self.bounds.height:
+                    bg = pg.transform.scale(bg, self.bounds.size)
+                self.bg = bg
+
         if self.dirty:
             self.dirty = False
             tb = self.bounds
             self.bounds = pg.Rect(0, 0, tb.width, tb.height)
-            if self.bg:
-                _THEME.drawImage(self.surf, self.bounds, self.bg)
+            # children resolve view-relative rects while at the origin
+            self._invalidateRect()
+
+            children = self.children
+            if self._painted and children:
+                # Incremental repaint: restore the background beneath
+                # each dirty child and re-render just that subtree,
+                # clipped to its rect. Assumes siblings don't overlap.
+                vsurf = self.surf
+                for c in children:
+                    if c.dirty:
+                        rect = c.getRect()
+                        vsurf.set_clip(rect)
+                        if self.bg:
+                            vsurf.blit(self.bg, rect, rect)
+                        else:
+                            _THEME.drawFrame(vsurf, rect)
+                        c.render(vsurf)
+                vsurf.set_clip(None)
             else:
-                _THEME.drawFrame(self.surf, self.bounds)
-
-            self._delegate('render', self.surf)
+                if self.bg:
+                    _THEME.drawImage(self.surf, self.bounds, self.bg)
+                else:
+                    _THEME.drawFrame(self.surf, self.bounds)
+                self._delegate('render', self.surf)
+                self._painted = True
 
             self.bounds = tb
+            self._invalidateRect()
 
         if surf:
             surf.blit(self.surf, self.getRect().topleft)
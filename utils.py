@@ -5,6 +5,8 @@ utils.py : Various utilities needed for games.
 """
 
 from abc import ABCMeta
+from enum import IntEnum, IntFlag
+from itertools import count
 
 
 """
@@ -20,9 +22,13 @@ ConnState = enum("DISCONNECTED",
 state = Connstate.DISCONNECTED
 """
 def enum(*sequential, **named):
-    enums = dict(zip(sequential, range(len(sequential))), **named)
-    enums["debug"] = sequential
-    return type('Enum', (), enums)
+    # IntEnum members are interned and attribute access is cached on the
+    # type; duplicate values become aliases, same as the old dict merge.
+    members = [(name, idx) for idx, name in enumerate(sequential)]
+    members.extend(named.items())
+    enums = IntEnum('Enum', members)
+    enums.debug = sequential
+    return enums
 #end enum
 
 
@@ -43,9 +49,12 @@ Format = flags(
 format = Format.CENTER_HORZ | Format.PAD_VERT
 """
 def flags(*sequential, **named):
-    flags = dict(zip(sequential, [0]+[1 << x for x in range(len(sequential)-1)]), **named)
-    flags["debug"] = sequential
-    return type('Flags', (), flags)
+    members = [(name, 0 if i == 0 else 1 << (i-1))
+               for i, name in enumerate(sequential)]
+    members.extend(named.items())
+    flags = IntFlag('Flags', members)
+    flags.debug = sequential
+    return flags
 #end flags
 
 
@@ -79,6 +88,20 @@ not implemented all the methods of the interface. Ignores "_****" methods.
 """
 class Interface(metaclass=ABCMeta):
 
+    # Hook verdicts keyed (interface, subclass). ABCMeta caches too, but
+    # its caches are flushed whenever any ABC registers a new class;
+    # this one only grows.
+    _hook_cache = {}
+
+    _iface_attrs = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Snapshot the public attrs once at class creation so the hook
+        # never re-filters __dict__.
+        cls._iface_attrs = tuple((attr, value) for attr, value in cls.__dict__.items()
+                                 if not attr.startswith('_'))
+
     @classmethod
     def _findInterface(cls, subclass):
         mro = type.mro(subclass)
@@ -89,15 +112,23 @@ class Interface(metaclass=ABCMeta):
 
     @classmethod
     def __subclasshook__(cls, subclass):
+        key = (cls, subclass)
+        result = Interface._hook_cache.get(key)
+        if result is None:
+            result = cls._checkInterface(subclass)
+            Interface._hook_cache[key] = result
+        return result
+
+    @classmethod
+    def _checkInterface(cls, subclass):
         interface = cls._findInterface(subclass)
         if not interface:
             return False
 
-        for attr in interface.__dict__:
-            if not attr.startswith('_'):
-                attrfunc = getattr(subclass, attr, None)
-                if not attrfunc or not callable(attrfunc) or attrfunc is interface.__dict__[attr]:
-                    return False
+        for attr, stub in interface._iface_attrs:
+            attrfunc = getattr(subclass, attr, None)
+            if not attrfunc or not callable(attrfunc) or attrfunc is stub:
+                return False
         return True
 
 #end Interface
@@ -119,26 +150,36 @@ class IdAllocator(IAllocator):
             assert start_id < end_id
         self.start = start_id
         self.end = end_id
+        # Fresh ids come from a C-level counter; deallocated ids are
+        # recycled through the freelist before the counter advances.
         self.curr = start_id
+        self._counter = count(start_id)
+        self._free = []
 
     def allocate(self, reserve = None):
-        if self.empty():
+        if reserve is None and self._free:
+            return self._free.pop()
+
+        # only a plain allocate() can be satisfied by the freelist; the
+        # reserve/counter path must respect the range on its own
+        if self.end and self.curr >= self.end:
             return None #Generator is empty
-            
+
         if reserve and self.curr < reserve:
+            # jump the counter past the reserved id
             self.curr = reserve + 1
+            self._counter = count(self.curr)
         else:
-            reserve = self.curr
-            self.curr = self.curr + 1
+            reserve = next(self._counter)
+            self.curr = reserve + 1
 
         return reserve
 
     def deallocate(self, value):
-        #deallocate does nothing for a basic allocator
-        pass
+        self._free.append(value)
 
     def empty(self):
-        return self.end and self.curr >= self.end
+        return self.end and self.curr >= self.end and not self._free
 
 #end IdAllocator
 IAllocator.register(IdAllocator)